@@ -0,0 +1,76 @@
+"""
+Numba Kernels
+JIT-compiled inner loops for the backtesting hot path.
+"""
+
+import numpy as np
+import numba
+
+
+@numba.njit(cache=True, fastmath=True)
+def _run_strategy(rets, states, rule, lag, out):
+    """
+    Fill per-bar strategy returns in a single pass.
+
+    Parameters:
+    -----------
+    rets : np.ndarray, shape (N, 3)
+        Daily ETF returns, one column per ETF
+    states : np.ndarray, shape (N,)
+        Regime state per bar (int)
+    rule : np.ndarray, shape (K,)
+        State -> return-column index; -1 means no allocation
+    lag : int
+        Execution lag in bars
+    out : np.ndarray, shape (N - lag,)
+        Output buffer, aligned to bars lag..N-1; bars whose state has
+        no allocation are set to NaN
+    """
+    n = rets.shape[0]
+    for i in range(lag, n):
+        s = states[i - lag]
+        c = rule[s]
+        if c >= 0:
+            out[i - lag] = rets[i, c]
+        else:
+            out[i - lag] = np.nan
+
+
+@numba.njit(cache=True, fastmath=True)
+def _all_metrics(r):
+    """
+    Accumulate every metric input in a single traversal of the returns.
+
+    Parameters:
+    -----------
+    r : np.ndarray, shape (N,)
+        Daily returns
+
+    Returns:
+    --------
+    tuple : (sum, sum_sq, neg_sum, neg_sum_sq, neg_count,
+             final_cumprod, max_drawdown)
+    """
+    total = 0.0
+    total_sq = 0.0
+    neg_total = 0.0
+    neg_total_sq = 0.0
+    neg_count = 0
+    cum = 1.0
+    peak = 1.0
+    mdd = 0.0
+    for i in range(r.shape[0]):
+        x = r[i]
+        total += x
+        total_sq += x * x
+        if x < 0.0:
+            neg_total += x
+            neg_total_sq += x * x
+            neg_count += 1
+        cum *= 1.0 + x
+        if cum > peak:
+            peak = cum
+        dd = cum / peak - 1.0
+        if dd < mdd:
+            mdd = dd
+    return total, total_sq, neg_total, neg_total_sq, neg_count, cum, mdd
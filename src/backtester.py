@@ -6,9 +6,16 @@ Performance evaluation and strategy comparison.
 import numpy as np
 import pandas as pd
 
+from _kernels import _run_strategy, _all_metrics
+
 class StrategyBacktester:
     """Backtest regime-based allocation strategy."""
-    
+
+    # Column order of the internal returns matrix; hot paths work with
+    # these integer indices, names only appear at I/O boundaries
+    _ETFS = ('TLT', 'GLD', 'SPY')
+    _RET_COLS = tuple(f'{etf}_ret' for etf in _ETFS)
+
     def __init__(self, returns_data, states):
         """
         Initialize backtester.
@@ -23,6 +30,14 @@ class StrategyBacktester:
         self.returns = returns_data
         self.states = states
         self.results = {}
+        # Column-major float32 copy of the return columns: every hot path
+        # reduces over one column at a time, so F-order gives unit-stride
+        # access, and float32 halves the bandwidth per pass. Daily returns
+        # need nowhere near float64 precision; all reductions accumulate
+        # in float64 (see calculate_metrics / calculate_regime_performance)
+        self._ret_arr = np.asfortranarray(
+            returns_data[list(self._RET_COLS)].to_numpy(dtype=np.float32)
+        )
         
     def calculate_regime_performance(self):
         """
@@ -32,37 +47,46 @@ class StrategyBacktester:
         --------
         pd.DataFrame : Mean returns by regime and ETF
         """
-        df = pd.DataFrame({
-            'state': self.states,
-            'TLT_ret': self.returns['TLT_ret'],
-            'GLD_ret': self.returns['GLD_ret'],
-            'SPY_ret': self.returns['SPY_ret']
-        })
-        
-        # Mean returns by state
-        regime_perf = df.groupby('state')[['TLT_ret', 'GLD_ret', 'SPY_ret']].mean()
-        regime_perf = regime_perf * 10000  # Convert to basis points
-        
+        states_arr = np.asarray(self.states)
+        rets = self._ret_arr
+
+        # Sort by state, then reduce each contiguous run in one pass
+        # (two O(N) passes instead of pandas' general groupby machinery)
+        order = np.argsort(states_arr, kind='stable')
+        sorted_states = states_arr[order]
+        boundaries = np.concatenate(([0], np.flatnonzero(np.diff(sorted_states)) + 1))
+
+        # Accumulate in float64 so the group means don't pick up float32 drift
+        sums = np.add.reduceat(rets[order].astype(np.float64), boundaries, axis=0)
+        counts = np.diff(np.concatenate((boundaries, [len(states_arr)])))
+        means = sums / counts[:, None] * 10000  # Convert to basis points
+
+        regime_perf = pd.DataFrame(
+            means,
+            index=pd.Index(sorted_states[boundaries], name='state'),
+            columns=list(self._RET_COLS)
+        )
+
         return regime_perf
     
     def create_allocation_rules(self, regime_perf):
         """
         Create allocation rules: pick best ETF for each regime.
-        
+
         Parameters:
         -----------
         regime_perf : pd.DataFrame
             Mean returns by regime
-            
+
         Returns:
         --------
-        dict : State -> ETF mapping
+        np.ndarray : int8 state -> ETF column index lookup table
+            (-1 for states without an allocation)
         """
-        rules = {}
-        for state in regime_perf.index:
-            best_etf = regime_perf.loc[state].idxmax().replace('_ret', '')
-            rules[state] = best_etf
-        
+        states = regime_perf.index.to_numpy()
+        rules = np.full(states.max() + 1, -1, dtype=np.int8)
+        rules[states] = regime_perf.to_numpy().argmax(axis=1).astype(np.int8)
+
         return rules
     
     def backtest_strategy(self, allocation_rules, lag_days=1):
@@ -71,8 +95,8 @@ class StrategyBacktester:
         
         Parameters:
         -----------
-        allocation_rules : dict
-            State -> ETF mapping
+        allocation_rules : np.ndarray
+            int8 state -> ETF column index lookup table
         lag_days : int
             Execution lag (default: 1 day)
             
@@ -80,22 +104,20 @@ class StrategyBacktester:
         --------
         pd.Series : Strategy daily returns
         """
-        # Create signals with lag
-        signals = pd.Series(self.states, index=self.returns.index)
-        signals_lagged = signals.shift(lag_days)
-        
-        # Map states to allocations
-        allocations = signals_lagged.map(allocation_rules)
-        
-        # Calculate strategy returns
-        strategy_returns = pd.Series(index=self.returns.index, dtype=float)
-        
-        for idx in strategy_returns.index:
-            if pd.notna(allocations[idx]):
-                etf = allocations[idx]
-                strategy_returns[idx] = self.returns.loc[idx, f'{etf}_ret']
-        
-        return strategy_returns.dropna()
+        # Map each state to a column index of the internal returns matrix
+        rets = self._ret_arr
+        n = len(rets)
+
+        # int8 lookup table: one cache-hot load per bar, no string handling
+        states_arr = np.ascontiguousarray(self.states, dtype=np.int64)
+        rule = np.asarray(allocation_rules, dtype=np.int8)
+
+        # Only the first lag_days bars lack a signal, so fill a buffer of
+        # length n - lag_days directly instead of dropna on a full-length one
+        out = np.empty(n - lag_days, dtype=np.float64)
+        _run_strategy(rets, states_arr, rule, lag_days, out)
+
+        return pd.Series(out, index=self.returns.index[lag_days:])
     
     def calculate_metrics(self, returns):
         """
@@ -110,31 +132,33 @@ class StrategyBacktester:
         --------
         dict : Performance metrics
         """
-        # Convert to percent
-        returns_pct = returns * 100
-        
+        # One fused pass over the returns gathers every accumulator
+        # (sum, sum of squares, downside moments, cumprod, drawdown)
+        r = np.ascontiguousarray(returns, dtype=np.float64)
+        n = len(r)
+        (total, total_sq, neg_total, neg_total_sq,
+         neg_count, final_cum, max_drawdown) = _all_metrics(r)
+
         # Cumulative return
-        cumulative = (1 + returns).prod() - 1
-        
-        # Annualized metrics
-        n_years = len(returns) / 252
+        cumulative = final_cum - 1
+
+        # Annualized metrics (sample std, ddof=1, from the moment sums)
+        n_years = n / 252
         ann_return = (1 + cumulative) ** (1/n_years) - 1
-        ann_vol = returns.std() * np.sqrt(252)
-        
+        ann_vol = np.sqrt((total_sq - total**2 / n) / (n - 1)) * np.sqrt(252)
+
         # Sharpe ratio (assuming 0% risk-free rate)
         sharpe = ann_return / ann_vol if ann_vol > 0 else 0
-        
+
         # Sortino ratio
-        downside_returns = returns[returns < 0]
-        downside_vol = downside_returns.std() * np.sqrt(252)
+        if neg_count > 1:
+            downside_vol = np.sqrt(
+                (neg_total_sq - neg_total**2 / neg_count) / (neg_count - 1)
+            ) * np.sqrt(252)
+        else:
+            downside_vol = 0
         sortino = ann_return / downside_vol if downside_vol > 0 else 0
-        
-        # Maximum drawdown
-        cumulative_returns = (1 + returns).cumprod()
-        running_max = cumulative_returns.expanding().max()
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = drawdown.min()
-        
+
         return {
             'Total Return': f"{cumulative*100:.1f}%",
             'Annual Return': f"{ann_return*100:.1f}%",
@@ -154,14 +178,14 @@ class StrategyBacktester:
         dict : Benchmark returns
         """
         benchmarks = {}
-        
+
         # Equal weight (rebalanced monthly)
-        ew_returns = (self.returns['TLT_ret'] + self.returns['GLD_ret'] + self.returns['SPY_ret']) / 3
-        benchmarks['Equal Weight'] = ew_returns
-        
+        ew_returns = self._ret_arr.mean(axis=1)
+        benchmarks['Equal Weight'] = pd.Series(ew_returns, index=self.returns.index)
+
         # Buy and hold SPY
-        benchmarks['Buy & Hold SPY'] = self.returns['SPY_ret']
-        
+        benchmarks['Buy & Hold SPY'] = pd.Series(self._ret_arr[:, 2], index=self.returns.index)
+
         return benchmarks
     
     def run_full_backtest(self):
@@ -180,21 +204,27 @@ class StrategyBacktester:
         # Step 2: Create allocation rules
         rules = self.create_allocation_rules(regime_perf)
         print("\nAllocation Rules:")
-        for state, etf in rules.items():
-            print(f"  State {state} -> {etf}")
+        for state, col in enumerate(rules):
+            if col >= 0:
+                print(f"  State {state} -> {self._ETFS[col]}")
         
         # Step 3: Backtest strategy
         strategy_returns = self.backtest_strategy(rules)
-        
-        # Step 4: Calculate metrics
-        results = {}
-        results['Regime Strategy'] = self.calculate_metrics(strategy_returns)
-        
-        # Step 5: Benchmark comparison
-        benchmarks = self.create_benchmarks()
-        for name, returns in benchmarks.items():
-            results[name] = self.calculate_metrics(returns)
-        
+
+        # Step 4+5: Metrics for strategy and benchmarks in one batch.
+        # Align everything on the full index (the strategy's missing lag
+        # days become 0-return bars) and stack column-wise, F-ordered so
+        # the per-column metrics kernel streams contiguous memory.
+        idx = self.returns.index
+        all_returns = {'Regime Strategy': strategy_returns.reindex(idx).fillna(0.0)}
+        all_returns.update(self.create_benchmarks())
+
+        R = np.asfortranarray(np.column_stack(
+            [s.to_numpy(dtype=np.float64) for s in all_returns.values()]
+        ))
+        results = {name: self.calculate_metrics(R[:, j])
+                   for j, name in enumerate(all_returns)}
+
         # Create comparison table
         comparison = pd.DataFrame(results).T
         
@@ -49,13 +49,17 @@ def compute_returns(prices):
     --------
     pd.DataFrame : Returns and VIX changes
     """
-    returns = pd.DataFrame(index=prices.index)
-    
-    # Log returns for ETFs
-    for col in ['TLT', 'GLD', 'SPY']:
-        if col in prices.columns:
-            returns[f'{col}_ret'] = np.log(prices[col] / prices[col].shift(1))
-    
+    # Log returns for ETFs: one np.log over a 2-D block instead of
+    # three per-column division+log passes
+    etf_cols = [col for col in ['TLT', 'GLD', 'SPY'] if col in prices.columns]
+    P = prices[etf_cols].to_numpy()
+    R = np.empty_like(P, dtype=np.float64)
+    R[1:] = np.log(P[1:] / P[:-1])
+    R[0] = np.nan
+
+    returns = pd.DataFrame(R, index=prices.index,
+                           columns=[f'{col}_ret' for col in etf_cols])
+
     # VIX change (not log return since VIX is already volatility)
     if 'VIX' in prices.columns:
         returns['VIX_change'] = prices['VIX'].diff()
@@ -66,33 +70,53 @@ def compute_returns(prices):
     
     return returns
 
-def load_and_prepare_data(save_path='data/market_data.csv'):
+def load_and_prepare_data(save_path='data/market_data.parquet'):
     """
     Main function to download and prepare all data.
-    
+
     Parameters:
     -----------
     save_path : str
-        Path to save processed data
-        
+        Path to save processed data; a .csv extension writes CSV,
+        anything else writes zstd-compressed Parquet
+
     Returns:
     --------
     pd.DataFrame : Processed returns data
     """
     # Download prices
     prices = download_market_data()
-    
+
     # Compute returns
     returns = compute_returns(prices)
-    
-    # Save to CSV
-    returns.to_csv(save_path)
+
+    # Parquet by default: exact float round-trip, much smaller files and
+    # far faster reloads than CSV text parsing
+    if save_path.endswith('.csv'):
+        returns.to_csv(save_path)
+    else:
+        returns.to_parquet(save_path, compression='zstd')
     print(f"\nData saved to {save_path}")
     print(f"Shape: {returns.shape}")
     print(f"\nColumns: {list(returns.columns)}")
     
     return returns
 
+def load_prepared_data(path='data/market_data.parquet'):
+    """
+    Load previously prepared returns data.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the saved Parquet file
+
+    Returns:
+    --------
+    pd.DataFrame : Processed returns data
+    """
+    return pd.read_parquet(path)
+
 if __name__ == "__main__":
     # Test the module
     data = load_and_prepare_data()
@@ -3,6 +3,9 @@ Regime Detection Module
 Identifies market volatility regimes using HMM.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
 import pandas as pd
 from hmmlearn import hmm
@@ -24,17 +27,21 @@ class RegimeDetector:
         self.model = None
         self.scaler = StandardScaler()
         
-    def fit(self, vix_changes, random_state=42):
+    def fit(self, vix_changes, random_state=42, warm_start_model=None):
         """
         Fit HMM to VIX changes.
-        
+
         Parameters:
         -----------
         vix_changes : array-like
             Daily VIX changes
         random_state : int
             Random seed for reproducibility
-            
+        warm_start_model : hmm.GaussianHMM, optional
+            Fitted model with one state fewer; when given, this fit is
+            seeded by splitting its widest state, which typically
+            converges in far fewer EM iterations than a cold start
+
         Returns:
         --------
         self
@@ -42,21 +49,81 @@ class RegimeDetector:
         # Reshape and standardize
         X = np.array(vix_changes).reshape(-1, 1)
         X_scaled = self.scaler.fit_transform(X)
-        
-        # Fit Gaussian HMM
-        self.model = hmm.GaussianHMM(
-            n_components=self.n_regimes,
-            covariance_type="full",
-            n_iter=100,
-            random_state=random_state
-        )
-        
+
+        if (warm_start_model is not None
+                and warm_start_model.n_components == self.n_regimes - 1):
+            self.model = self._split_warm_start(warm_start_model, random_state)
+        else:
+            # Fit Gaussian HMM ("diag" is equivalent to "full" for a single
+            # feature but skips the generic Cholesky path per M-step)
+            self.model = hmm.GaussianHMM(
+                n_components=self.n_regimes,
+                covariance_type="diag",
+                n_iter=100,
+                random_state=random_state
+            )
+
         self.model.fit(X_scaled)
         print(f"Fitted {self.n_regimes}-state HMM")
         print(f"Converged: {self.model.monitor_.converged}")
-        
+
         return self
-    
+
+    def _split_warm_start(self, prev, random_state):
+        """
+        Seed a K-state HMM from a fitted (K-1)-state model.
+
+        Duplicates the highest-variance state (with a small mean
+        perturbation so EM can separate the twins) and splits its start
+        and incoming transition probabilities between the two halves.
+
+        Parameters:
+        -----------
+        prev : hmm.GaussianHMM
+            Fitted model with self.n_regimes - 1 states
+        random_state : int
+            Random seed for reproducibility
+
+        Returns:
+        --------
+        hmm.GaussianHMM : Initialized, unfitted K-state model
+        """
+        K = prev.n_components
+        # covars_ reads back as full (K, 1, 1) matrices; the diag setter
+        # below wants (K, 1)
+        prev_vars = prev.covars_[:, 0, 0]
+        j = int(np.argmax(prev_vars))
+
+        startprob = np.append(prev.startprob_, prev.startprob_[j] / 2)
+        startprob[j] /= 2
+
+        transmat = np.zeros((K + 1, K + 1))
+        transmat[:K, :K] = prev.transmat_
+        transmat[K, :K] = prev.transmat_[j]
+        transmat[:, K] = transmat[:, j] / 2
+        transmat[:, j] /= 2
+
+        means = np.vstack((prev.means_, prev.means_[j]))
+        covars = np.append(prev_vars, prev_vars[j]).reshape(-1, 1)
+        eps = np.sqrt(prev_vars[j]) * 0.01
+        means[j, 0] -= eps
+        means[K, 0] += eps
+
+        model = hmm.GaussianHMM(
+            n_components=K + 1,
+            covariance_type="diag",
+            n_iter=30,
+            random_state=random_state,
+            init_params="",
+            params="stmc"
+        )
+        model.startprob_ = startprob
+        model.transmat_ = transmat
+        model.means_ = means
+        model.covars_ = covars
+
+        return model
+
     def predict(self, vix_changes):
         """
         Predict regime states.
@@ -90,12 +157,26 @@ class RegimeDetector:
         --------
         pd.DataFrame : Mean and std of VIX changes by regime
         """
-        df = pd.DataFrame({
-            'state': states,
-            'vix_change': vix_changes
-        })
-        
-        stats = df.groupby('state')['vix_change'].agg(['mean', 'std', 'count'])
+        states_arr = np.asarray(states)
+        vix = np.asarray(vix_changes, dtype=np.float64)
+
+        # Sort by state and aggregate contiguous runs with reduceat
+        # (avoids pandas groupby dispatch for a tiny 3-group aggregation)
+        order = np.argsort(states_arr, kind='stable')
+        sorted_states = states_arr[order]
+        vix_sorted = vix[order]
+        boundaries = np.concatenate(([0], np.flatnonzero(np.diff(sorted_states)) + 1))
+
+        counts = np.diff(np.concatenate((boundaries, [len(states_arr)])))
+        sums = np.add.reduceat(vix_sorted, boundaries)
+        sumsq = np.add.reduceat(vix_sorted * vix_sorted, boundaries)
+        means = sums / counts
+        stds = np.sqrt((sumsq - counts * means ** 2) / (counts - 1))
+
+        stats = pd.DataFrame(
+            {'mean': means, 'std': stds, 'count': counts},
+            index=pd.Index(sorted_states[boundaries], name='state')
+        )
         stats = stats.sort_values('mean')
         
         # Rename states based on volatility level
@@ -129,7 +210,7 @@ class RegimeDetector:
         X_scaled = self.scaler.transform(X)
         
         log_likelihood = self.model.score(X_scaled)
-        n_params = self.n_regimes ** 2 + 2 * self.n_regimes  # Transition matrix + means + variances
+        n_params = self.n_regimes ** 2 + 2 * self.n_regimes  # Transition matrix + means + diag variances
         n_samples = len(vix_changes)
         
         aic = 2 * n_params - 2 * log_likelihood
@@ -142,30 +223,53 @@ class RegimeDetector:
             'BIC': bic
         }
 
-def compare_models(vix_changes, n_states_list=[2, 3, 4]):
+def _fit_and_score(vix_changes, n):
+    """Fit an n-state HMM and return its selection scores (worker function)."""
+    detector = RegimeDetector(n_regimes=n)
+    detector.fit(vix_changes)
+    return detector.score_model(vix_changes)
+
+def compare_models(vix_changes, n_states_list=[2, 3, 4], warm_start=True):
     """
     Compare HMM models with different number of states.
-    
+
+    By default each candidate is warm-started from the previous (one
+    state fewer) fit by splitting its widest state, which cuts the EM
+    iterations per fit by roughly an order of magnitude. With
+    warm_start=False the candidates are instead fit cold and in
+    parallel across processes.
+
     Parameters:
     -----------
     vix_changes : array-like
         VIX changes
     n_states_list : list
         List of state counts to compare
-        
+    warm_start : bool
+        Seed each fit from the previous candidate (default: True)
+
     Returns:
     --------
     pd.DataFrame : Comparison table
     """
     results = []
-    
-    for n in n_states_list:
-        detector = RegimeDetector(n_regimes=n)
-        detector.fit(vix_changes)
-        scores = detector.score_model(vix_changes)
-        results.append(scores)
-    
-    comparison = pd.DataFrame(results)
+
+    if warm_start:
+        prev_model = None
+        for n in n_states_list:
+            detector = RegimeDetector(n_regimes=n)
+            detector.fit(vix_changes, warm_start_model=prev_model)
+            results.append(detector.score_model(vix_changes))
+            prev_model = detector.model
+    else:
+        max_workers = min(len(n_states_list), os.cpu_count())
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_fit_and_score, vix_changes, n)
+                       for n in n_states_list]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+    comparison = pd.DataFrame(results).sort_values('n_states').reset_index(drop=True)
     print("\nModel Comparison:")
     print(comparison)
     
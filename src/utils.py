@@ -4,6 +4,8 @@ Author: Shadaab Ahmed
 """
 
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
+from matplotlib.patches import Patch
 import seaborn as sns
 import pandas as pd
 import numpy as np
@@ -13,6 +15,33 @@ sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 6)
 plt.rcParams['font.size'] = 10
 
+# Crisis windows shaded in plot_cumulative_returns; parsed once at import
+_CRISIS_PERIODS = [
+    (pd.Timestamp('2008-09-01'), pd.Timestamp('2009-03-31'), '2008 Crisis'),
+    (pd.Timestamp('2020-02-01'), pd.Timestamp('2020-04-30'), 'COVID-19'),
+]
+
+def _cum_and_dd(returns):
+    """
+    Compute cumulative growth, running max and drawdown for a returns series.
+
+    Shared by the metrics and plotting paths so the cumulative product is
+    only computed once per series instead of once per caller.
+
+    Parameters:
+    -----------
+    returns : array-like
+        Daily returns
+
+    Returns:
+    --------
+    tuple : (cumulative, running_max, drawdown) ndarrays
+    """
+    cumulative = np.cumprod(1 + np.asarray(returns))
+    running_max = np.maximum.accumulate(cumulative)
+    drawdown = cumulative / running_max - 1.0
+    return cumulative, running_max, drawdown
+
 def plot_regime_classification(dates, vix, states, title="VIX Regime Classification"):
     """
     Plot VIX with color-coded regimes.
@@ -30,19 +59,17 @@ def plot_regime_classification(dates, vix, states, title="VIX Regime Classificat
     """
     fig, ax = plt.subplots(figsize=(14, 6))
     
-    # Create colormap
+    # One scatter call colored by state: a single PathCollection instead
+    # of a mask + draw call per state
     unique_states = sorted(set(states))
-    colors = ['green', 'orange', 'red'][:len(unique_states)]
-    
-    for state, color in zip(unique_states, colors):
-        mask = states == state
-        ax.scatter(dates[mask], vix[mask], c=color, s=1, alpha=0.6, 
-                  label=f'State {state}')
-    
+    cmap = ListedColormap(['green', 'orange', 'red'][:len(unique_states)])
+    ax.scatter(dates, vix, c=states, cmap=cmap, s=1, alpha=0.6)
+
     ax.set_xlabel('Date')
     ax.set_ylabel('VIX Level')
     ax.set_title(title, fontsize=14, fontweight='bold')
-    ax.legend()
+    ax.legend(handles=[Patch(color=color, label=f'State {state}')
+                       for state, color in zip(unique_states, cmap.colors)])
     ax.grid(True, alpha=0.3)
     
     plt.tight_layout()
@@ -62,8 +89,8 @@ def plot_cumulative_returns(returns_dict, title="Cumulative Returns Comparison")
     fig, ax = plt.subplots(figsize=(14, 7))
     
     for name, returns in returns_dict.items():
-        cumulative = (1 + returns).cumprod()
-        ax.plot(cumulative.index, cumulative.values, label=name, linewidth=2)
+        cumulative, _, _ = _cum_and_dd(returns)
+        ax.plot(returns.index, cumulative, label=name, linewidth=2)
     
     ax.set_xlabel('Date')
     ax.set_ylabel('Cumulative Return (1 = 100%)')
@@ -72,14 +99,8 @@ def plot_cumulative_returns(returns_dict, title="Cumulative Returns Comparison")
     ax.grid(True, alpha=0.3)
     
     # Add crisis shading
-    crisis_periods = [
-        ('2008-09-01', '2009-03-31', '2008 Crisis'),
-        ('2020-02-01', '2020-04-30', 'COVID-19'),
-    ]
-    
-    for start, end, label in crisis_periods:
-        ax.axvspan(pd.Timestamp(start), pd.Timestamp(end), 
-                   alpha=0.1, color='red')
+    for start, end, label in _CRISIS_PERIODS:
+        ax.axvspan(start, end, alpha=0.1, color='red')
     
     plt.tight_layout()
     return fig
@@ -98,10 +119,8 @@ def plot_drawdowns(returns_dict, title="Drawdown Comparison"):
     fig, ax = plt.subplots(figsize=(14, 6))
     
     for name, returns in returns_dict.items():
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max * 100
-        ax.plot(drawdown.index, drawdown.values, label=name, linewidth=2)
+        _, _, drawdown = _cum_and_dd(returns)
+        ax.plot(returns.index, drawdown * 100, label=name, linewidth=2)
     
     ax.set_xlabel('Date')
     ax.set_ylabel('Drawdown (%)')